@@ -1,12 +1,20 @@
 import streamlit as st
+import streamlit.components.v1 as components
 import time
 from datetime import timedelta
-import xml.etree.ElementTree as ET
-from xml.dom import minidom
+from xml.sax.saxutils import escape
 import io
 import os
 from pathlib import Path
 import json
+import re
+import hashlib
+import shutil
+import tempfile
+import zipfile
+import uuid
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Audio recording and processing
 try:
@@ -14,68 +22,254 @@ try:
     AUDIO_RECORDER_AVAILABLE = True
 except ImportError:
     AUDIO_RECORDER_AVAILABLE = False
+
+# Local transcription (optional)
+try:
+    from faster_whisper import WhisperModel
+    LOCAL_WHISPER_AVAILABLE = True
+except ImportError:
+    LOCAL_WHISPER_AVAILABLE = False
     
 import openai
 from anthropic import Anthropic
 from elevenlabs import ElevenLabs, VoiceSettings
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Initialize session state
-if 'running' not in st.session_state:
-    st.session_state.running = False
-if 'start_time' not in st.session_state:
-    st.session_state.start_time = None
-if 'elapsed_time' not in st.session_state:
-    st.session_state.elapsed_time = 0
-if 'laps' not in st.session_state:
-    st.session_state.laps = []
-if 'current_lap_start' not in st.session_state:
-    st.session_state.current_lap_start = 0
-if 'audio_data' not in st.session_state:
-    st.session_state.audio_data = None
-if 'transcription' not in st.session_state:
-    st.session_state.transcription = ""
-if 'script' not in st.session_state:
-    st.session_state.script = ""
-if 'generated_audio' not in st.session_state:
-    st.session_state.generated_audio = None
-if 'music_request' not in st.session_state:
-    st.session_state.music_request = ""
-if 'sfx_requests' not in st.session_state:
-    st.session_state.sfx_requests = []
+if '_initialized' not in st.session_state:
+    # One guarded update on first run instead of a membership check per key every rerun
+    st.session_state.update({
+        'running': False,
+        'virtual_start': None,
+        'elapsed_time': 0,
+        'laps': [],
+        'current_lap_start': 0,
+        'audio_data': None,
+        'transcription': "",
+        'script': "",
+        'script_json': "",
+        'generated_audio': None,
+        'music_request': "",
+        'sfx_requests': [],
+        'session_id': uuid.uuid4().hex,
+    })
+    st.session_state._initialized = True
 
 def format_time(seconds):
     """Format seconds to HH:MM:SS.mmm"""
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
-    milliseconds = int((seconds % 1) * 1000)
+    return _format_time_ms(int(seconds * 1000))
+
+@lru_cache(maxsize=4096)
+def _format_time_ms(ms):
+    """Format integer milliseconds to HH:MM:SS.mmm"""
+    hours, rem = divmod(ms, 3_600_000)
+    minutes, rem = divmod(rem, 60_000)
+    secs, milliseconds = divmod(rem, 1000)
     return f"{hours:02d}:{minutes:02d}:{secs:02d}.{milliseconds:03d}"
 
+@lru_cache(maxsize=4096)
 def timecode_to_frames(seconds, fps=30):
     """Convert seconds to frame count"""
     return int(seconds * fps)
 
+# Generated audio and transcriptions are cached on disk by request content,
+# so identical requests are not paid for twice. The cache is shared by all
+# sessions and bounded by size and age, evicting least recently used first.
+API_CACHE_DIR = Path(tempfile.gettempdir()) / "audio_tour_cache"
+API_CACHE_MAX_BYTES = 512 * 1024 * 1024
+API_CACHE_MAX_AGE = 7 * 24 * 3600
+API_CACHE_EVICT_INTERVAL = 5 * 60
+
+# Generated files for each session live under their own directory and are
+# pruned once a session has gone a day without rendering them
+SESSION_AUDIO_DIR = Path(tempfile.gettempdir()) / "audio_tour_sessions"
+SESSION_AUDIO_MAX_AGE = 24 * 3600
+
+PARAGRAPH_BOUNDARY_RE = re.compile(r'\n\s*\n')
+SENTENCE_BOUNDARY_RE = re.compile(r'(?<=[.!?])\s+')
+CLAUSE_BOUNDARY_RE = re.compile(r'(?<=[,;:])\s+')
+WORD_BOUNDARY_RE = re.compile(r'\s+')
+# Narration is split at the coarsest of these that keeps chunks in budget
+TTS_BOUNDARY_RES = (PARAGRAPH_BOUNDARY_RE, SENTENCE_BOUNDARY_RE, CLAUSE_BOUNDARY_RE, WORD_BOUNDARY_RE)
+
+VOICE_SETTINGS = {
+    "stability": 0.5,
+    "similarity_boost": 0.75,
+    "style": 0.0,
+    "use_speaker_boost": True
+}
+
+def api_cache_key(*parts):
+    """Hash the parts of an API request into a cache key"""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode("utf-8")).hexdigest()
+
+def api_cache_entries():
+    """Return (path, stat) for each finished cache entry, skipping in-flight writes"""
+    try:
+        paths = list(API_CACHE_DIR.iterdir())
+    except FileNotFoundError:
+        return []
+    entries = []
+    for path in paths:
+        # Skip in-flight writes and the eviction stamp
+        if path.suffix == ".tmp" or path.name.startswith("."):
+            continue
+        try:
+            entries.append((path, path.stat()))
+        except FileNotFoundError:
+            # Evicted by another session between listing and stat
+            continue
+    return entries
+
+def api_cache_get(key):
+    """Return cached response bytes for a key, or None on a miss"""
+    path = API_CACHE_DIR / key
+    try:
+        data = path.read_bytes()
+        # Bump mtime so eviction drops least recently used entries first
+        os.utime(path)
+    except FileNotFoundError:
+        return None
+    return data
+
+def api_cache_evict():
+    """Drop expired entries, then the oldest ones until the cache fits its budget"""
+    # Scanning the whole cache is costly, so run at most once per interval
+    # across all sessions; the stamp file's mtime records the last run
+    stamp = API_CACHE_DIR / ".last_eviction"
+    now = time.time()
+    try:
+        if now - stamp.stat().st_mtime < API_CACHE_EVICT_INTERVAL:
+            return
+    except FileNotFoundError:
+        pass
+    try:
+        stamp.touch()
+    except FileNotFoundError:
+        # Nothing has been cached yet
+        return
+    
+    total = 0
+    for path, stat in sorted(api_cache_entries(), key=lambda entry: entry[1].st_mtime, reverse=True):
+        total += stat.st_size
+        if total > API_CACHE_MAX_BYTES or now - stat.st_mtime > API_CACHE_MAX_AGE:
+            path.unlink(missing_ok=True)
+
+def api_cache_put(key, data):
+    """Store response bytes under a key"""
+    # Private to the app's user: entries include transcripts of recordings
+    API_CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+    tmp_path = API_CACHE_DIR / f"{key}.{uuid.uuid4().hex}.tmp"
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, API_CACHE_DIR / key)
+
+def start_session_audio_batch(prefix):
+    """Prune idle sessions' audio and drop this session's files from the previous batch"""
+    session_id = st.session_state.session_id
+    now = time.time()
+    try:
+        session_dirs = list(SESSION_AUDIO_DIR.iterdir())
+    except FileNotFoundError:
+        session_dirs = []
+    for session_dir in session_dirs:
+        try:
+            stale = session_dir.name != session_id and now - session_dir.stat().st_mtime > SESSION_AUDIO_MAX_AGE
+        except FileNotFoundError:
+            continue
+        if stale:
+            shutil.rmtree(session_dir, ignore_errors=True)
+    
+    # Otherwise a shorter regeneration leaves old files behind
+    for path in (SESSION_AUDIO_DIR / session_id).glob(f"{prefix}_*.mp3"):
+        path.unlink(missing_ok=True)
+
+def touch_session_audio():
+    """Mark this session's audio as in use so pruning keeps it"""
+    try:
+        os.utime(SESSION_AUDIO_DIR / st.session_state.session_id)
+    except FileNotFoundError:
+        pass
+
+def save_session_audio(audio_bytes, file_name):
+    """Write generated audio to this session's temp dir and return its path"""
+    SESSION_AUDIO_DIR.mkdir(mode=0o700, exist_ok=True)
+    session_dir = SESSION_AUDIO_DIR / st.session_state.session_id
+    session_dir.mkdir(mode=0o700, exist_ok=True)
+    path = session_dir / file_name
+    path.write_bytes(audio_bytes)
+    return str(path)
+
+def available_audio(items):
+    """Return the generated audio items whose files are still on disk"""
+    return [item for item in items or [] if os.path.isfile(item['path'])]
+
+@st.cache_data(ttl=60)
+def api_cache_size():
+    """Return the total size of the API cache in bytes, refreshed at most once a minute"""
+    return sum(stat.st_size for _, stat in api_cache_entries())
+
+# Each user brings their own key, so bound how many clients (and keys) the
+# process keeps alive
+@st.cache_resource(max_entries=16, ttl=3600)
+def get_openai_client(api_key):
+    """Return a shared OpenAI client for this key"""
+    return openai.OpenAI(api_key=api_key)
+
+@st.cache_resource(max_entries=16, ttl=3600)
+def get_anthropic_client(api_key):
+    """Return a shared Anthropic client for this key"""
+    return Anthropic(api_key=api_key)
+
+@st.cache_resource(max_entries=16, ttl=3600)
+def get_elevenlabs_client(api_key):
+    """Return a shared ElevenLabs client for this key"""
+    return ElevenLabs(api_key=api_key)
+
 def transcribe_audio(audio_bytes, api_key):
     """Transcribe audio using OpenAI Whisper"""
     try:
-        client = openai.OpenAI(api_key=api_key)
-        
-        # Save audio to temporary file
-        with open("temp_audio.wav", "wb") as f:
-            f.write(audio_bytes)
-        
-        # Transcribe
-        with open("temp_audio.wav", "rb") as audio_file:
-            transcript = client.audio.transcriptions.create(
-                model="whisper-1",
-                file=audio_file,
-                response_format="text"
-            )
+        cache_key = api_cache_key("whisper-1", hashlib.sha256(audio_bytes).hexdigest())
+        cached = api_cache_get(cache_key)
+        if cached is not None:
+            return cached.decode("utf-8")
+        
+        client = get_openai_client(api_key)
+        
+        # Upload straight from memory rather than via a shared temp file
+        transcript = client.audio.transcriptions.create(
+            model="whisper-1",
+            file=("temp_audio.wav", audio_bytes),
+            response_format="text"
+        )
+        
+        api_cache_put(cache_key, transcript.encode("utf-8"))
+        api_cache_evict()
+        return transcript
+    except Exception as e:
+        st.error(f"Transcription error: {str(e)}")
+        return None
+
+@st.cache_resource
+def get_local_whisper_model():
+    """Load the local faster-whisper model once per process"""
+    return WhisperModel("base.en", device="cpu", compute_type="int8")
+
+def transcribe_audio_local(audio_bytes):
+    """Transcribe audio locally using faster-whisper"""
+    try:
+        cache_key = api_cache_key("faster-whisper-base.en", hashlib.sha256(audio_bytes).hexdigest())
+        cached = api_cache_get(cache_key)
+        if cached is not None:
+            return cached.decode("utf-8")
         
-        # Clean up
-        os.remove("temp_audio.wav")
+        model = get_local_whisper_model()
+        segments, _ = model.transcribe(io.BytesIO(audio_bytes), beam_size=1, vad_filter=True)
+        transcript = " ".join(segment.text.strip() for segment in segments)
         
+        api_cache_put(cache_key, transcript.encode("utf-8"))
+        api_cache_evict()
         return transcript
     except Exception as e:
         st.error(f"Transcription error: {str(e)}")
@@ -85,10 +279,10 @@ def generate_audio_tour_script(transcription, laps, api_key, model_choice="claud
     """Generate audio tour script using LLM"""
     try:
         # Prepare context about the tour sections
-        sections_info = "\n".join([
+        sections_info = "\n".join(
             f"Section {i+1} ({lap['title']}): Duration {format_time(lap['duration'])}"
             for i, lap in enumerate(laps)
-        ])
+        )
         
         prompt = f"""Based on the following brainstorming notes and tour structure, create a professional audio tour script.
 
@@ -121,7 +315,7 @@ Format the output as JSON with this structure:
 """
 
         if model_choice == "claude":
-            client = Anthropic(api_key=api_key)
+            client = get_anthropic_client(api_key)
             message = client.messages.create(
                 model="claude-sonnet-4-20250514",
                 max_tokens=4000,
@@ -131,7 +325,7 @@ Format the output as JSON with this structure:
             )
             response_text = message.content[0].text
         else:  # OpenAI
-            client = openai.OpenAI(api_key=api_key)
+            client = get_openai_client(api_key)
             response = client.chat.completions.create(
                 model="gpt-4-turbo-preview",
                 messages=[
@@ -150,61 +344,206 @@ Format the output as JSON with this structure:
         st.error(f"Script generation error: {str(e)}")
         return None
 
-def generate_voice_audio(text, api_key, voice_id, model_id="eleven_turbo_v2_5"):
-    """Generate audio using ElevenLabs API"""
-    try:
-        client = ElevenLabs(api_key=api_key)
-        
-        audio = client.text_to_speech.convert(
-            voice_id=voice_id,
-            model_id=model_id,
-            text=text,
-            voice_settings=VoiceSettings(
-                stability=0.5,
-                similarity_boost=0.75,
-                style=0.0,
-                use_speaker_boost=True
-            )
-        )
-        
-        # Convert generator to bytes
-        audio_bytes = b""
-        for chunk in audio:
-            audio_bytes += chunk
-        
-        return audio_bytes
+def synthesize_voice(text, client, voice_id, model_id="eleven_turbo_v2_5", previous_text=None, next_text=None):
+    """Synthesize narration with ElevenLabs and return the MP3 bytes"""
+    cache_key = api_cache_key("tts", text, voice_id, model_id, VOICE_SETTINGS, previous_text, next_text)
+    cached = api_cache_get(cache_key)
+    if cached is not None:
+        return cached
     
-    except Exception as e:
-        st.error(f"Voice generation error: {str(e)}")
-        return None
+    # Neighbouring chunks of the same section, so prosody carries across joins
+    kwargs = {}
+    if previous_text:
+        kwargs["previous_text"] = previous_text
+    if next_text:
+        kwargs["next_text"] = next_text
+    
+    audio = client.text_to_speech.convert(
+        voice_id=voice_id,
+        model_id=model_id,
+        text=text,
+        voice_settings=VoiceSettings(**VOICE_SETTINGS),
+        **kwargs
+    )
+    
+    # Convert generator to bytes; join once instead of re-copying on every chunk
+    audio_bytes = b"".join(chunk for chunk in audio if chunk)
+    
+    api_cache_put(cache_key, audio_bytes)
+    return audio_bytes
 
-def generate_sound_effect(description, api_key):
-    """Generate sound effect using ElevenLabs API"""
-    try:
-        url = "https://api.elevenlabs.io/v1/sound-generation"
-        
-        headers = {
-            "xi-api-key": api_key,
-            "Content-Type": "application/json"
+def _tts_spans(text, start, end, max_chars, level=0):
+    """Yield (start, end) spans of text no longer than max_chars, splitting at the coarsest boundary that fits"""
+    if end - start <= max_chars:
+        yield start, end
+        return
+    if level == len(TTS_BOUNDARY_RES):
+        # An unbroken run longer than max_chars is cut hard
+        for pos in range(start, end, max_chars):
+            yield pos, min(pos + max_chars, end)
+        return
+    pos = start
+    for match in TTS_BOUNDARY_RES[level].finditer(text, start, end):
+        yield from _tts_spans(text, pos, match.start(), max_chars, level + 1)
+        pos = match.end()
+    yield from _tts_spans(text, pos, end, max_chars, level + 1)
+
+def chunk_for_tts(text, max_chars=1000):
+    """Split narration into sentence-aligned chunks of at most max_chars"""
+    text = text.strip()
+    if len(text) <= max_chars:
+        return [text] if text else []
+    
+    # Chunks are sliced from the source so line and paragraph breaks,
+    # which ElevenLabs reads as pauses, survive inside each chunk
+    chunks = []
+    chunk_start = chunk_end = None
+    for start, end in _tts_spans(text, 0, len(text), max_chars):
+        if chunk_start is None:
+            chunk_start = start
+        elif end - chunk_start > max_chars:
+            chunks.append(text[chunk_start:chunk_end].strip())
+            chunk_start = start
+        chunk_end = end
+    chunks.append(text[chunk_start:chunk_end].strip())
+    return [chunk for chunk in chunks if chunk]
+
+def generate_voice_audio(sections, api_key, voice_id, max_workers=5):
+    """Generate narration for all sections concurrently using ElevenLabs API"""
+    start_session_audio_batch("narration")
+    progress = st.progress(0.0, text="Generating voice narration...")
+    section_chunks = [chunk_for_tts(section['script']) for section in sections]
+    # Resolve the shared client here; worker threads must not touch st.* caches
+    client = get_elevenlabs_client(api_key)
+    audio_chunks = {}
+    failed = set()
+    
+    # Requests are network-bound, so a small thread pool overlaps them
+    # while staying within ElevenLabs' concurrency limits. Long sections
+    # are split so no single request runs into the API timeout.
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                synthesize_voice, chunk, client, voice_id,
+                previous_text=chunks[j - 1] if j > 0 else None,
+                next_text=chunks[j + 1] if j + 1 < len(chunks) else None
+            ): (i, j)
+            for i, chunks in enumerate(section_chunks)
+            for j, chunk in enumerate(chunks)
         }
         
-        data = {
-            "text": description,
-            "duration_seconds": 5.0,
-            "prompt_influence": 0.3
+        for done, future in enumerate(as_completed(futures), start=1):
+            i, j = futures[future]
+            try:
+                audio_chunks[i, j] = future.result()
+            except Exception as e:
+                if i not in failed:
+                    st.error(f"Voice generation error (Section {sections[i]['section_number']}): {str(e)}")
+                failed.add(i)
+            progress.progress(done / len(futures), text=f"Generated {done} of {len(futures)} narration parts")
+    
+    # Evict once per batch here rather than on every put in the workers
+    api_cache_evict()
+    
+    # MP3 frames can be concatenated without re-encoding
+    return [
+        {
+            'section': section['section_number'],
+            'title': section['title'],
+            'label': f"⬇️ Section {section['section_number']}: {section['title']}",
+            'file_name': f"section_{section['section_number']}_{section['title'].replace(' ', '_')}.mp3",
+            'path': save_session_audio(
+                b"".join(audio_chunks[i, j] for j in range(len(section_chunks[i]))),
+                f"narration_{i + 1}.mp3"
+            )
+        }
+        for i, section in enumerate(sections)
+        if section_chunks[i] and i not in failed
+    ]
+
+@st.cache_resource
+def get_http_session():
+    """Return a shared HTTP session so repeated API calls reuse connections"""
+    session = requests.Session()
+    
+    # Only retry failures where the request was never processed, so a
+    # paid generation is never submitted twice: connection errors before
+    # the body was sent, and 429/503 rejections. Read timeouts and
+    # gateway errors (502/504) may arrive after the job was accepted.
+    retries = Retry(
+        total=3,
+        connect=3,
+        read=0,
+        other=0,
+        status=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 503],
+        allowed_methods=frozenset({"GET", "POST"})
+    )
+    session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retries))
+    return session
+
+def request_sound_effect(description, api_key, session):
+    """Generate a sound effect with ElevenLabs and return the MP3 bytes"""
+    url = "https://api.elevenlabs.io/v1/sound-generation"
+    
+    headers = {
+        "xi-api-key": api_key,
+        "Content-Type": "application/json"
+    }
+    
+    data = {
+        "text": description,
+        "duration_seconds": 5.0,
+        "prompt_influence": 0.3
+    }
+    
+    cache_key = api_cache_key("sfx", data)
+    cached = api_cache_get(cache_key)
+    if cached is not None:
+        return cached
+    
+    response = session.post(url, json=data, headers=headers, timeout=(5, 60))
+    
+    if response.status_code != 200:
+        raise RuntimeError(response.text)
+    
+    api_cache_put(cache_key, response.content)
+    return response.content
+
+def generate_sound_effects(descriptions, api_key, max_workers=3):
+    """Generate sound effects concurrently using ElevenLabs API"""
+    start_session_audio_batch("sfx")
+    session = get_http_session()
+    progress = st.progress(0.0, text="Generating sound effects...")
+    results = {}
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(request_sound_effect, description, api_key, session): i
+            for i, description in enumerate(descriptions)
         }
         
-        response = requests.post(url, json=data, headers=headers)
-        
-        if response.status_code == 200:
-            return response.content
-        else:
-            st.warning(f"Sound effect generation failed: {response.text}")
-            return None
+        for done, future in enumerate(as_completed(futures), start=1):
+            i = futures[future]
+            try:
+                results[i] = future.result()
+            except Exception as e:
+                st.warning(f"Sound effect generation failed ({descriptions[i]}): {str(e)}")
+            progress.progress(done / len(futures), text=f"Generated {done} of {len(futures)} sound effects")
     
-    except Exception as e:
-        st.error(f"Sound effect generation error: {str(e)}")
-        return None
+    api_cache_evict()
+    
+    return [
+        {
+            'name': description,
+            'label': f"⬇️ {description}",
+            'file_name': f"sfx_{description.replace(' ', '_')}.mp3",
+            'path': save_session_audio(results[i], f"sfx_{i + 1}.mp3")
+        }
+        for i, description in enumerate(descriptions)
+        if results.get(i)
+    ]
 
 def create_suno_music_request(description):
     """Create a formatted request for Suno AI music generation"""
@@ -229,53 +568,372 @@ Please generate and download the music file, then add it to your audio tour proj
 """
     return request
 
+# DaVinci Resolve XML templates (xmeml v4)
+_RESOLVE_XML_HEADER = """<?xml version='1.0' encoding='utf-8'?>
+<xmeml version="4">
+  <sequence>
+    <name>Audio Tour Timeline</name>
+    <duration>{duration}</duration>
+"""
+
+_RESOLVE_XML_SEQUENCE_SETTINGS = """    <rate>
+      <timebase>{fps}</timebase>
+      <ntsc>FALSE</ntsc>
+    </rate>
+    <timecode>
+      <rate>
+        <timebase>{fps}</timebase>
+        <ntsc>FALSE</ntsc>
+      </rate>
+      <string>00:00:00:00</string>
+      <frame>0</frame>
+    </timecode>
+    <media>
+      <video>
+        <track>
+"""
+
+FPS_OPTIONS = [24, 25, 30, 60]
+
+# Sequence settings only depend on the frame rate, so render them up front
+_RESOLVE_XML_SETTINGS_BY_FPS = {
+    fps: _RESOLVE_XML_SEQUENCE_SETTINGS.format(fps=fps) for fps in FPS_OPTIONS
+}
+
+_RESOLVE_XML_CLIPITEM = """          <clipitem id="clipitem-{id}">
+            <name>{title}</name>
+            <duration>{duration}</duration>
+            <rate>
+              <timebase>{fps}</timebase>
+              <ntsc>FALSE</ntsc>
+            </rate>
+            <in>0</in>
+            <out>{duration}</out>
+            <start>{start}</start>
+            <end>{end}</end>
+            <marker>
+              <name>{title}</name>
+              <comment>Duration: {duration_fmt}</comment>
+              <in>{start}</in>
+              <out>{end}</out>
+            </marker>
+          </clipitem>
+"""
+
+_RESOLVE_XML_FOOTER = """        </track>
+      </video>
+    </media>
+  </sequence>
+</xmeml>"""
+
 def generate_resolve_xml(laps, fps=30):
     """Generate DaVinci Resolve compatible XML with markers"""
-    xmeml = ET.Element('xmeml', version='4')
+    laps_tuple = tuple(
+        (lap['title'], lap['start_time'], lap['end_time'], lap['duration'])
+        for lap in laps
+    )
+    return _generate_resolve_xml_cached(laps_tuple, fps)
+
+@st.cache_data(max_entries=8)
+def _generate_resolve_xml_cached(laps_tuple, fps):
+    """Build the Resolve XML from a hashable snapshot of the laps"""
+    laps = [
+        {'title': title, 'start_time': start_time, 'end_time': end_time, 'duration': duration}
+        for title, start_time, end_time, duration in laps_tuple
+    ]
+    
+    end_frame = timecode_to_frames(laps[-1]['end_time'], fps) if laps else 0
+    
+    buf = io.StringIO()
+    buf.write(_RESOLVE_XML_HEADER.format(duration=end_frame))
+    buf.write(
+        _RESOLVE_XML_SETTINGS_BY_FPS.get(fps)
+        or _RESOLVE_XML_SEQUENCE_SETTINGS.format(fps=fps)
+    )
+    
+    for i, lap in enumerate(laps):
+        buf.write(_RESOLVE_XML_CLIPITEM.format(
+            id=i + 1,
+            title=escape(lap['title']),
+            fps=fps,
+            duration=timecode_to_frames(lap['duration'], fps),
+            start=timecode_to_frames(lap['start_time'], fps),
+            end=timecode_to_frames(lap['end_time'], fps),
+            duration_fmt=format_time(lap['duration'])
+        ))
+    
+    buf.write(_RESOLVE_XML_FOOTER)
+    return buf.getvalue()
+
+def get_current_elapsed():
+    """Return the elapsed timer value in seconds"""
+    if st.session_state.running:
+        return time.monotonic() - st.session_state.virtual_start
+    return st.session_state.elapsed_time
+
+# Timer readout drawn in the browser. The same template renders both states,
+# so the font and height don't jump between running and paused. Streamlit
+# doesn't pass its theme into component iframes, so the text colour is
+# given explicitly, or read from the parent page as a fallback.
+_TIMER_HTML = """
+<div id="timer" style="font-family: 'Source Code Pro', ui-monospace, SFMono-Regular, Menlo, Consolas, monospace; font-size: 2rem; font-weight: 600; line-height: 60px;"></div>
+<script>
+const timer = document.getElementById("timer");
+let color = "{text_color}";
+if (!color) {{
+    try {{
+        color = getComputedStyle(window.parent.document.body).color;
+    }} catch (e) {{
+        color = "#31333F";
+    }}
+}}
+timer.style.color = color;
+const running = {running};
+const start = Date.now() - {elapsed_ms};
+const pad = (n, width) => String(n).padStart(width, "0");
+function tick() {{
+    const ms = running ? Date.now() - start : {elapsed_ms};
+    timer.textContent =
+        pad(Math.floor(ms / 3600000), 2) + ":" +
+        pad(Math.floor(ms / 60000) % 60, 2) + ":" +
+        pad(Math.floor(ms / 1000) % 60, 2) + "." +
+        pad(ms % 1000, 3);
+}}
+tick();
+if (running) {{
+    setInterval(tick, 100);
+}}
+</script>
+"""
+
+def get_theme_text_color():
+    """Return the active theme's text colour, or "" if it can't be determined"""
+    color = st.get_option("theme.textColor")
+    if color:
+        return color
+    # st.context.theme only exists in newer Streamlit releases
+    theme = getattr(getattr(st, "context", None), "theme", None)
+    theme_type = theme.get("type") if theme else None
+    return {"dark": "#FAFAFA", "light": "#31333F"}.get(theme_type, "")
+
+def render_timer_display():
+    """Render the timer readout, ticking in the browser while the timer is running"""
+    running = st.session_state.running
+    elapsed = get_current_elapsed() if running else st.session_state.elapsed_time
+    components.html(
+        _TIMER_HTML.format(
+            elapsed_ms=int(elapsed * 1000),
+            running="true" if running else "false",
+            text_color=get_theme_text_color()
+        ),
+        height=60
+    )
+
+def apply_lap_edits():
+    """Apply title edits and deletions from the section table to the lap list"""
+    edited_rows = st.session_state.laps_editor['edited_rows']
+    laps = st.session_state.laps
     
-    sequence = ET.SubElement(xmeml, 'sequence')
-    ET.SubElement(sequence, 'name').text = 'Audio Tour Timeline'
-    ET.SubElement(sequence, 'duration').text = str(timecode_to_frames(laps[-1]['end_time'], fps) if laps else 0)
+    deleted_ids = set()
+    for row, changes in edited_rows.items():
+        lap = laps[int(row)]
+        if changes.get('Title'):
+            lap['title'] = changes['Title']
+        if changes.get('Delete'):
+            deleted_ids.add(lap['id'])
     
-    rate = ET.SubElement(sequence, 'rate')
-    ET.SubElement(rate, 'timebase').text = str(fps)
-    ET.SubElement(rate, 'ntsc').text = 'FALSE'
+    if deleted_ids:
+        st.session_state.laps = [lap for lap in laps if lap['id'] not in deleted_ids]
+
+@st.fragment
+def render_sfx_panel(script_data, elevenlabs_key):
+    """Render sound effect selection and generation; selection changes rerun only this panel"""
+    touch_session_audio()
+    sfx_list = []
+    for section in script_data.get('sections', []):
+        for sfx in section.get('sound_effects', []):
+            if sfx not in sfx_list:
+                sfx_list.append(sfx)
     
-    timecode = ET.SubElement(sequence, 'timecode')
-    ET.SubElement(timecode, 'rate')
-    rate_tc = timecode.find('rate')
-    ET.SubElement(rate_tc, 'timebase').text = str(fps)
-    ET.SubElement(rate_tc, 'ntsc').text = 'FALSE'
-    ET.SubElement(timecode, 'string').text = '00:00:00:00'
-    ET.SubElement(timecode, 'frame').text = '0'
+    selected_sfx = []
+    if sfx_list:
+        st.write("**Detected Sound Effects:**")
+        selected_sfx = st.multiselect(
+            "Select sound effects to generate:",
+            sfx_list,
+            default=sfx_list[:3]  # Select first 3 by default
+        )
     
-    media = ET.SubElement(sequence, 'media')
-    video = ET.SubElement(media, 'video')
-    track = ET.SubElement(video, 'track')
+    extra_sfx = st.text_area(
+        "Additional sound effects (one per line):",
+        height=100
+    )
     
-    for i, lap in enumerate(laps):
-        clipitem = ET.SubElement(track, 'clipitem', id=f"clipitem-{i+1}")
-        ET.SubElement(clipitem, 'name').text = lap['title']
-        ET.SubElement(clipitem, 'duration').text = str(timecode_to_frames(lap['duration'], fps))
+    if st.button("🎼 Generate Selected Sound Effects"):
+        # Deduplicate while keeping the user's order
+        descriptions = list(dict.fromkeys(
+            selected_sfx + [line.strip() for line in extra_sfx.splitlines() if line.strip()]
+        ))
+        if not elevenlabs_key:
+            st.error("Please enter your ElevenLabs API Key in the sidebar")
+        elif not descriptions:
+            st.warning("Select or enter at least one sound effect")
+        else:
+            with st.spinner("Generating sound effects..."):
+                generated_sfx = generate_sound_effects(descriptions, elevenlabs_key)
+                
+                st.session_state.sfx_requests = generated_sfx
+                st.success(f"Generated {len(generated_sfx)} sound effects!")
+                # Full rerun so the export tab picks up the new files
+                st.rerun()
+    
+    # Display generated SFX
+    if st.session_state.sfx_requests:
+        st.write("**Generated Sound Effects:**")
+        for sfx_item in available_audio(st.session_state.sfx_requests):
+            st.write(f"**{sfx_item['name']}**")
+            st.audio(sfx_item['path'], format="audio/mp3")
+
+# files holds (path, archive name, mtime) tuples; the mtime only keys the
+# cache so regenerated files rebuild the archive. cache_resource shares the
+# bytes instead of copying them on every rerun.
+@st.cache_resource(max_entries=4)
+def build_audio_zip(files):
+    """Bundle generated audio into a ZIP archive"""
+    buf = io.BytesIO()
+    # MP3 is already compressed, so store the files as-is
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_STORED) as archive:
+        for path, arcname, _ in files:
+            archive.write(path, arcname)
+    return buf.getvalue()
+
+@st.fragment
+def render_export_tab():
+    """Render the export tab; its own widgets rerun only this fragment"""
+    # Runs on every full rerun, so an open session's files stay fresh
+    touch_session_audio()
+    st.header("📦 Export Your Audio Tour")
+    
+    if not any([
+        st.session_state.laps,
+        st.session_state.generated_audio,
+        st.session_state.sfx_requests,
+        st.session_state.music_request,
+        st.session_state.script
+    ]):
+        st.info("Nothing to export yet. Create sections in Tab 2 and generate your script and audio in Tabs 3-4.")
+        return
+    
+    # Session files may have been pruned or purged from the temp dir
+    narration_files = available_audio(st.session_state.generated_audio)
+    sfx_files = available_audio(st.session_state.sfx_requests)
+    
+    export_col1, export_col2 = st.columns(2)
+    
+    # XML Timeline Export
+    with export_col1:
+        st.subheader("🎬 DaVinci Resolve Timeline")
         
-        clip_rate = ET.SubElement(clipitem, 'rate')
-        ET.SubElement(clip_rate, 'timebase').text = str(fps)
-        ET.SubElement(clip_rate, 'ntsc').text = 'FALSE'
+        if st.session_state.laps:
+            fps = st.selectbox(
+                "Frame Rate (FPS)",
+                options=FPS_OPTIONS,
+                index=2
+            )
+            
+            xml_content = generate_resolve_xml(st.session_state.laps, fps)
+            
+            st.download_button(
+                label="⬇️ Download XML Timeline",
+                data=xml_content,
+                file_name="audio_tour_timeline.xml",
+                mime="application/xml",
+                use_container_width=True,
+                type="primary"
+            )
+        else:
+            st.info("Create sections in Tab 2 to export timeline")
+    
+    # Audio Export
+    with export_col2:
+        st.subheader("🎧 Audio Files")
         
-        ET.SubElement(clipitem, 'in').text = '0'
-        ET.SubElement(clipitem, 'out').text = str(timecode_to_frames(lap['duration'], fps))
-        ET.SubElement(clipitem, 'start').text = str(timecode_to_frames(lap['start_time'], fps))
-        ET.SubElement(clipitem, 'end').text = str(timecode_to_frames(lap['end_time'], fps))
+        if narration_files or sfx_files:
+            archive_files = [
+                (
+                    audio_item['path'],
+                    f"narration/{audio_item['file_name']}",
+                    os.path.getmtime(audio_item['path'])
+                )
+                for audio_item in narration_files
+            ] + [
+                (
+                    sfx_item['path'],
+                    f"sfx/{sfx_item['file_name']}",
+                    os.path.getmtime(sfx_item['path'])
+                )
+                for sfx_item in sfx_files
+            ]
+            
+            st.download_button(
+                label="⬇️ Download All Audio (ZIP)",
+                data=build_audio_zip(tuple(archive_files)),
+                file_name="audio_tour_audio.zip",
+                mime="application/zip",
+                use_container_width=True,
+                type="primary"
+            )
+            
+            # Per-file buttons each load a whole MP3, so only build them on request
+            if st.toggle("Show individual files"):
+                for i, audio_item in enumerate(narration_files):
+                    st.download_button(
+                        label=audio_item['label'],
+                        data=Path(audio_item['path']).read_bytes(),
+                        file_name=audio_item['file_name'],
+                        mime="audio/mp3",
+                        use_container_width=True,
+                        key=f"audio_download_{i}"
+                    )
+                for i, sfx_item in enumerate(sfx_files):
+                    st.download_button(
+                        label=sfx_item['label'],
+                        data=Path(sfx_item['path']).read_bytes(),
+                        file_name=sfx_item['file_name'],
+                        mime="audio/mp3",
+                        use_container_width=True,
+                        key=f"sfx_download_{i}"
+                    )
+        else:
+            st.info("Generate audio in Tab 4 to download")
+    
+    st.divider()
+    
+    # Suno Music Request
+    if st.session_state.music_request:
+        st.subheader("🎵 Suno AI Music Generation")
+        
+        st.text_area(
+            "Copy this request and use it on Suno AI:",
+            value=st.session_state.music_request,
+            height=300
+        )
         
-        marker = ET.SubElement(clipitem, 'marker')
-        ET.SubElement(marker, 'name').text = lap['title']
-        ET.SubElement(marker, 'comment').text = f"Duration: {format_time(lap['duration'])}"
-        ET.SubElement(marker, 'in').text = str(timecode_to_frames(lap['start_time'], fps))
-        ET.SubElement(marker, 'out').text = str(timecode_to_frames(lap['end_time'], fps))
+        st.markdown("[🎵 Open Suno AI](https://suno.ai)")
+    
+    st.divider()
     
-    xml_string = ET.tostring(xmeml, encoding='unicode')
-    dom = minidom.parseString(xml_string)
-    return dom.toprettyxml(indent='  ')
+    # Complete Script Export
+    if st.session_state.script:
+        st.subheader("📄 Complete Script")
+        
+        st.download_button(
+            label="⬇️ Download Complete Script (JSON)",
+            data=st.session_state.script_json,
+            file_name="audio_tour_script.json",
+            mime="application/json",
+            use_container_width=True
+        )
 
 # Page config
 st.set_page_config(
@@ -292,6 +950,11 @@ with st.sidebar:
     anthropic_key = st.text_input("Anthropic API Key", type="password", help="For Claude script generation")
     elevenlabs_key = st.text_input("ElevenLabs API Key", type="password", help="For voice & SFX generation")
     
+    use_local_whisper = LOCAL_WHISPER_AVAILABLE and st.checkbox(
+        "Use local Whisper (free, faster)",
+        help="Transcribe on this machine with faster-whisper instead of the OpenAI API"
+    )
+    
     st.divider()
     
     st.header("🎤 Voice Settings")
@@ -309,6 +972,15 @@ with st.sidebar:
         ["claude", "openai"],
         help="Choose which LLM to use for script generation"
     )
+    
+    st.divider()
+    
+    st.header("🗄️ Cache")
+    st.caption(
+        f"Cached audio & transcriptions: {api_cache_size() / (1024 * 1024):.1f} MB "
+        f"of {API_CACHE_MAX_BYTES // (1024 * 1024)} MB. "
+        f"Entries expire after {API_CACHE_MAX_AGE // (24 * 3600)} days."
+    )
 
 # Main App
 st.title("🎙️ AI Audio Tour Creator")
@@ -363,16 +1035,18 @@ with tab1:
     # Transcription button
     if audio_bytes or st.session_state.audio_data:
         if st.button("📝 Transcribe Audio", type="primary"):
-            if not openai_key:
+            if not openai_key and not use_local_whisper:
                 st.error("Please enter your OpenAI API Key in the sidebar")
             else:
                 with st.spinner("Transcribing audio..."):
                     audio_to_transcribe = audio_bytes if audio_bytes else st.session_state.audio_data
-                    transcription = transcribe_audio(audio_to_transcribe, openai_key)
+                    if use_local_whisper:
+                        transcription = transcribe_audio_local(audio_to_transcribe)
+                    else:
+                        transcription = transcribe_audio(audio_to_transcribe, openai_key)
                     if transcription:
                         st.session_state.transcription = transcription
                         st.success("Transcription complete!")
-                        st.rerun()
     
     if st.session_state.transcription:
         st.subheader("📄 Transcription")
@@ -392,13 +1066,7 @@ with tab2:
     with col1:
         st.subheader("Timer Control")
         
-        if st.session_state.running and st.session_state.start_time:
-            current_elapsed = st.session_state.elapsed_time + (time.time() - st.session_state.start_time)
-        else:
-            current_elapsed = st.session_state.elapsed_time
-        
-        timer_display = st.empty()
-        timer_display.markdown(f"## `{format_time(current_elapsed)}`")
+        render_timer_display()
         
         button_col1, button_col2, button_col3 = st.columns(3)
         
@@ -406,20 +1074,21 @@ with tab2:
             if not st.session_state.running:
                 if st.button("▶️ Start", use_container_width=True, type="primary"):
                     st.session_state.running = True
-                    st.session_state.start_time = time.time()
+                    st.session_state.virtual_start = time.monotonic() - st.session_state.elapsed_time
                     st.rerun()
             else:
                 if st.button("⏸️ Pause", use_container_width=True):
+                    st.session_state.elapsed_time = get_current_elapsed()
                     st.session_state.running = False
-                    st.session_state.elapsed_time += time.time() - st.session_state.start_time
-                    st.session_state.start_time = None
+                    st.session_state.virtual_start = None
                     st.rerun()
         
         with button_col2:
             if st.button("⏹️ Stop Lap", use_container_width=True, disabled=not st.session_state.running and st.session_state.elapsed_time == 0):
-                lap_end_time = current_elapsed
+                lap_end_time = get_current_elapsed()
                 
                 st.session_state.laps.append({
+                    'id': uuid.uuid4().hex,
                     'start_time': st.session_state.current_lap_start,
                     'end_time': lap_end_time,
                     'duration': lap_end_time - st.session_state.current_lap_start,
@@ -427,12 +1096,11 @@ with tab2:
                 })
                 
                 st.session_state.current_lap_start = lap_end_time
-                st.rerun()
         
         with button_col3:
             if st.button("🔄 Reset All", use_container_width=True):
                 st.session_state.running = False
-                st.session_state.start_time = None
+                st.session_state.virtual_start = None
                 st.session_state.elapsed_time = 0
                 st.session_state.laps = []
                 st.session_state.current_lap_start = 0
@@ -444,22 +1112,26 @@ with tab2:
         if st.session_state.laps:
             st.info(f"**Total Sections:** {len(st.session_state.laps)}")
             
-            for i, lap in enumerate(st.session_state.laps):
-                with st.expander(f"Section {i+1}: {lap['title']}", expanded=False):
-                    new_title = st.text_input(
-                        "Section Title",
-                        value=lap['title'],
-                        key=f"title_{i}"
-                    )
-                    st.session_state.laps[i]['title'] = new_title
-                    
-                    st.write(f"**Start:** `{format_time(lap['start_time'])}`")
-                    st.write(f"**End:** `{format_time(lap['end_time'])}`")
-                    st.write(f"**Duration:** `{format_time(lap['duration'])}`")
-                    
-                    if st.button(f"🗑️ Delete Section {i+1}", key=f"delete_{i}"):
-                        st.session_state.laps.pop(i)
-                        st.rerun()
+            st.data_editor(
+                {
+                    'Title': [lap['title'] for lap in st.session_state.laps],
+                    'Start': [format_time(lap['start_time']) for lap in st.session_state.laps],
+                    'End': [format_time(lap['end_time']) for lap in st.session_state.laps],
+                    'Duration': [format_time(lap['duration']) for lap in st.session_state.laps],
+                    'Delete': [False] * len(st.session_state.laps)
+                },
+                column_config={
+                    'Title': st.column_config.TextColumn("Section Title", required=True),
+                    'Start': st.column_config.TextColumn(disabled=True),
+                    'End': st.column_config.TextColumn(disabled=True),
+                    'Duration': st.column_config.TextColumn(disabled=True),
+                    'Delete': st.column_config.CheckboxColumn("🗑️ Delete")
+                },
+                hide_index=True,
+                use_container_width=True,
+                key="laps_editor",
+                on_change=apply_lap_edits
+            )
         else:
             st.info("No sections recorded yet. Start the timer and create your first lap!")
 
@@ -489,8 +1161,8 @@ with tab3:
                     
                     if script_data:
                         st.session_state.script = script_data
+                        st.session_state.script_json = json.dumps(script_data, indent=2)
                         st.success("Script generated successfully!")
-                        st.rerun()
         
         if st.session_state.script:
             st.subheader("📜 Generated Script")
@@ -504,10 +1176,13 @@ with tab3:
             # Display each section
             for section in script_data.get('sections', []):
                 with st.expander(f"Section {section['section_number']}: {section['title']}", expanded=True):
-                    st.markdown(f"**Script:**\n\n{section['script']}")
-                    st.write(f"**Duration:** {section.get('duration', 'N/A')}")
-                    st.write(f"**Music Mood:** {section.get('music_mood', 'N/A')}")
-                    st.write(f"**Sound Effects:** {', '.join(section.get('sound_effects', []))}")
+                    # One markdown element per section instead of four
+                    st.markdown(
+                        f"**Script:**\n\n{section['script']}\n\n"
+                        f"**Duration:** {section.get('duration', 'N/A')}\n\n"
+                        f"**Music Mood:** {section.get('music_mood', 'N/A')}\n\n"
+                        f"**Sound Effects:** {', '.join(section.get('sound_effects', []))}"
+                    )
             
             # Production notes
             if 'production_notes' in script_data:
@@ -530,80 +1205,28 @@ with tab4:
                 st.error("Please enter your ElevenLabs API Key in the sidebar")
             else:
                 with st.spinner("Generating voice narration for all sections..."):
-                    all_audio = []
-                    
-                    for section in script_data.get('sections', []):
-                        st.info(f"Generating Section {section['section_number']}...")
-                        audio_bytes = generate_voice_audio(
-                            section['script'],
-                            elevenlabs_key,
-                            voice_id
-                        )
-                        
-                        if audio_bytes:
-                            all_audio.append({
-                                'section': section['section_number'],
-                                'title': section['title'],
-                                'audio': audio_bytes
-                            })
+                    all_audio = generate_voice_audio(
+                        script_data.get('sections', []),
+                        elevenlabs_key,
+                        voice_id
+                    )
                     
                     st.session_state.generated_audio = all_audio
                     st.success(f"Generated narration for {len(all_audio)} sections!")
-                    st.rerun()
         
         # Display generated audio
         if st.session_state.generated_audio:
             st.subheader("🎧 Generated Audio Preview")
-            for audio_item in st.session_state.generated_audio:
+            for audio_item in available_audio(st.session_state.generated_audio):
                 st.write(f"**Section {audio_item['section']}: {audio_item['title']}**")
-                st.audio(audio_item['audio'], format="audio/mp3")
+                st.audio(audio_item['path'], format="audio/mp3")
         
         st.divider()
         
         # Sound Effects Generation
         st.subheader("🔔 Sound Effects Generation")
         
-        sfx_list = []
-        for section in script_data.get('sections', []):
-            for sfx in section.get('sound_effects', []):
-                if sfx not in sfx_list:
-                    sfx_list.append(sfx)
-        
-        if sfx_list:
-            st.write("**Detected Sound Effects:**")
-            selected_sfx = st.multiselect(
-                "Select sound effects to generate:",
-                sfx_list,
-                default=sfx_list[:3]  # Select first 3 by default
-            )
-            
-            if st.button("🎼 Generate Selected Sound Effects"):
-                if not elevenlabs_key:
-                    st.error("Please enter your ElevenLabs API Key in the sidebar")
-                else:
-                    with st.spinner("Generating sound effects..."):
-                        generated_sfx = []
-                        
-                        for sfx in selected_sfx:
-                            st.info(f"Generating: {sfx}...")
-                            sfx_audio = generate_sound_effect(sfx, elevenlabs_key)
-                            
-                            if sfx_audio:
-                                generated_sfx.append({
-                                    'name': sfx,
-                                    'audio': sfx_audio
-                                })
-                        
-                        st.session_state.sfx_requests = generated_sfx
-                        st.success(f"Generated {len(generated_sfx)} sound effects!")
-                        st.rerun()
-            
-            # Display generated SFX
-            if st.session_state.sfx_requests:
-                st.write("**Generated Sound Effects:**")
-                for sfx_item in st.session_state.sfx_requests:
-                    st.write(f"**{sfx_item['name']}**")
-                    st.audio(sfx_item['audio'], format="audio/mp3")
+        render_sfx_panel(script_data, elevenlabs_key)
         
         st.divider()
         
@@ -620,105 +1243,7 @@ with tab4:
                 suno_request = create_suno_music_request(music_desc)
                 st.session_state.music_request = suno_request
                 st.success("Music generation request created!")
-                st.rerun()
 
 # TAB 5: Export and Download
 with tab5:
-    st.header("📦 Export Your Audio Tour")
-    
-    export_col1, export_col2 = st.columns(2)
-    
-    # XML Timeline Export
-    with export_col1:
-        st.subheader("🎬 DaVinci Resolve Timeline")
-        
-        if st.session_state.laps:
-            fps = st.selectbox(
-                "Frame Rate (FPS)",
-                options=[24, 25, 30, 60],
-                index=2
-            )
-            
-            xml_content = generate_resolve_xml(st.session_state.laps, fps)
-            
-            st.download_button(
-                label="⬇️ Download XML Timeline",
-                data=xml_content,
-                file_name="audio_tour_timeline.xml",
-                mime="application/xml",
-                use_container_width=True,
-                type="primary"
-            )
-        else:
-            st.info("Create sections in Tab 2 to export timeline")
-    
-    # Audio Export
-    with export_col2:
-        st.subheader("🎧 Audio Files")
-        
-        if st.session_state.generated_audio:
-            for i, audio_item in enumerate(st.session_state.generated_audio):
-                st.download_button(
-                    label=f"⬇️ Section {audio_item['section']}: {audio_item['title']}",
-                    data=audio_item['audio'],
-                    file_name=f"section_{audio_item['section']}_{audio_item['title'].replace(' ', '_')}.mp3",
-                    mime="audio/mp3",
-                    use_container_width=True,
-                    key=f"audio_download_{i}"
-                )
-        else:
-            st.info("Generate audio in Tab 4 to download")
-    
-    st.divider()
-    
-    # Sound Effects Export
-    if st.session_state.sfx_requests:
-        st.subheader("🔔 Sound Effects")
-        
-        sfx_col1, sfx_col2 = st.columns(2)
-        for i, sfx_item in enumerate(st.session_state.sfx_requests):
-            col = sfx_col1 if i % 2 == 0 else sfx_col2
-            with col:
-                st.download_button(
-                    label=f"⬇️ {sfx_item['name']}",
-                    data=sfx_item['audio'],
-                    file_name=f"sfx_{sfx_item['name'].replace(' ', '_')}.mp3",
-                    mime="audio/mp3",
-                    use_container_width=True,
-                    key=f"sfx_download_{i}"
-                )
-    
-    st.divider()
-    
-    # Suno Music Request
-    if st.session_state.music_request:
-        st.subheader("🎵 Suno AI Music Generation")
-        
-        st.text_area(
-            "Copy this request and use it on Suno AI:",
-            value=st.session_state.music_request,
-            height=300
-        )
-        
-        st.markdown("[🎵 Open Suno AI](https://suno.ai)")
-    
-    st.divider()
-    
-    # Complete Script Export
-    if st.session_state.script:
-        st.subheader("📄 Complete Script")
-        
-        script_json = json.dumps(st.session_state.script, indent=2)
-        
-        st.download_button(
-            label="⬇️ Download Complete Script (JSON)",
-            data=script_json,
-            file_name="audio_tour_script.json",
-            mime="application/json",
-            use_container_width=True
-        )
-
-# Auto-refresh for running timer
-if st.session_state.running:
-    time.sleep(0.1)
-    st.rerun()
+    render_export_tab()